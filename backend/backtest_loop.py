@@ -4,9 +4,11 @@ The spec is a typed AST (see schema.py), so execution is a deterministic
 tree-walk — no LLM output is interpreted here. Anything schema-valid runs;
 anything else never reaches this module.
 """
+import operator
 from datetime import date
 from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 import vectorbt as vbt
 
@@ -19,6 +21,7 @@ from backend.schema import (
 )
 
 DEFAULT_WINDOWS = {"SMA": 20, "EMA": 20, "RSI": 14, "BB": 20}
+_COMPARATORS = {"gt": operator.gt, "lt": operator.lt, "gte": operator.ge, "lte": operator.le}
 
 
 def fetch_price_data(ticker: str, start_date: str, end_date: Optional[str]) -> Dict[str, pd.Series]:
@@ -137,13 +140,7 @@ def evaluate_condition(
             return (left > right) & (left.shift(1) <= right.shift(1))
         return (left < right) & (left.shift(1) >= right.shift(1))
 
-    ops = {
-        "gt": lambda a, b: a > b,
-        "lt": lambda a, b: a < b,
-        "gte": lambda a, b: a >= b,
-        "lte": lambda a, b: a <= b,
-    }
-    return ops[cond.op](left, right)
+    return _COMPARATORS[cond.op](left, right)
 
 
 def _safe_float(value, default=0.0) -> float:
@@ -202,77 +199,125 @@ def _build_chart_data(
     return chart
 
 
+def _simulate(spec: StrategySpec, price: Dict[str, pd.Series]) -> dict:
+    indicator_values = compute_indicators(price, spec.indicators)
+    indicator_types = {ind.id: ind.type for ind in spec.indicators}
+
+    entries = evaluate_condition(spec.entry, price, indicator_values, indicator_types)
+    if spec.exit is not None:
+        exits = evaluate_condition(spec.exit, price, indicator_values, indicator_types)
+    else:
+        exits = pd.Series(False, index=price["Close"].index)
+
+    portfolio = vbt.Portfolio.from_signals(
+        close=price["Close"],
+        entries=entries.fillna(False),
+        exits=exits.fillna(False),
+        init_cash=float(spec.initial_cash),  # int vs float would compile twice
+        fees=spec.fees,
+        sl_stop=spec.stop_loss,
+        tp_stop=spec.take_profit,
+        freq="D",
+    )
+
+    return {
+        "metrics": _build_metrics(portfolio, price["Close"]),
+        "chart_data": _build_chart_data(portfolio, price, indicator_values, entries, exits),
+        "strategy": spec.model_dump(exclude_none=True),
+    }
+
+
 def run_backtest_spec(spec: StrategySpec) -> dict:
     """Execute a validated strategy spec. Returns metrics + chart data,
     or an `error` key with a human-readable message."""
     try:
         price = fetch_price_data(spec.ticker, spec.start_date, spec.end_date)
-        indicator_values = compute_indicators(price, spec.indicators)
-        indicator_types = {ind.id: ind.type for ind in spec.indicators}
-
-        entries = evaluate_condition(spec.entry, price, indicator_values, indicator_types)
-        if spec.exit is not None:
-            exits = evaluate_condition(spec.exit, price, indicator_values, indicator_types)
-        else:
-            exits = pd.Series(False, index=price["Close"].index)
-
-        portfolio = vbt.Portfolio.from_signals(
-            close=price["Close"],
-            entries=entries.fillna(False),
-            exits=exits.fillna(False),
-            init_cash=spec.initial_cash,
-            fees=spec.fees,
-            sl_stop=spec.stop_loss,
-            tp_stop=spec.take_profit,
-            freq="D",
-        )
-
-        return {
-            "metrics": _build_metrics(portfolio, price["Close"]),
-            "chart_data": _build_chart_data(portfolio, price, indicator_values, entries, exits),
-            "strategy": spec.model_dump(exclude_none=True),
-        }
+        return _simulate(spec, price)
     except Exception as e:  # surface a clean message rather than a traceback
         print(f"[ERROR] Backtest failed: {e}")
         return {"error": str(e), "metrics": None, "chart_data": None}
 
 
+def warm_up() -> None:
+    """Run one small offline backtest touching every indicator type and stop
+    kind. vectorbt's numba kernels compile on first use (several seconds), so
+    calling this at startup keeps that cost off the first user request."""
+    # A seeded random walk long enough to produce both winning and losing
+    # trades, so the per-trade statistics kernels compile too.
+    index = pd.date_range("2000-01-01", periods=250, freq="D")
+    close = pd.Series(100 + np.random.default_rng(0).normal(0, 1, 250).cumsum(), index=index)
+    price = {
+        "Close": close,
+        "Open": close,
+        "High": close + 1,
+        "Low": close - 1,
+        "Volume": pd.Series(1_000_000.0, index=index),
+    }
+    fast = Operand(kind="indicator", indicator_id="sma")
+    slow = Operand(kind="indicator", indicator_id="ema")
+    spec = StrategySpec(
+        ticker="WARMUP",
+        stop_loss=0.05,
+        take_profit=0.1,
+        indicators=[
+            Indicator(id="sma", type="SMA", window=5),
+            Indicator(id="ema", type="EMA", window=10),
+            Indicator(id="rsi", type="RSI"),
+            Indicator(id="bb", type="BB"),
+            Indicator(id="macd", type="MACD"),
+        ],
+        entry=Condition(op="cross_above", left=fast, right=slow),
+        exit=Condition(op="cross_below", left=fast, right=slow),
+    )
+    # Stop-free strategies, and holds still open at the end of the period,
+    # each run separately compiled code paths.
+    no_stops = {"stop_loss": None, "take_profit": None}
+    _simulate(spec, price)
+    _simulate(spec.model_copy(update=no_stops), price)
+    _simulate(spec.model_copy(update={**no_stops, "exit": None}), price)
+
+
 # ---------------------------------------------------------------------------
 # Legacy named-strategy support for the /backtest endpoint: builds a
 # StrategySpec so both endpoints share one execution path.
 # ---------------------------------------------------------------------------
 
-def _legacy_spec(ticker, strategy, start_date, end_date, initial_cash, fees, **params) -> StrategySpec:
-    def sma_operand(ind_id):
-        return Operand(kind="indicator", indicator_id=ind_id, output="ma")
-
-    if strategy == "RSI":
-        window = params.get("rsi_period", 14)
-        rsi = Operand(kind="indicator", indicator_id="rsi", output="rsi")
-        return StrategySpec(
-            ticker=ticker, start_date=start_date, end_date=end_date,
-            initial_cash=initial_cash, fees=fees,
-            indicators=[Indicator(id="rsi", type="RSI", window=window)],
-            entry=Condition(op="lt", left=rsi,
-                            right=Operand(kind="constant", value=params.get("rsi_oversold", 30))),
-            exit=Condition(op="gt", left=rsi,
-                           right=Operand(kind="constant", value=params.get("rsi_overbought", 70))),
-        )
-
-    # Default: SMA crossover
-    fast, slow = params.get("sma_fast", 5), params.get("sma_slow", 20)
+def _rsi_spec(base: dict, params: dict) -> StrategySpec:
+    rsi = Operand(kind="indicator", indicator_id="rsi", output="rsi")
+    return StrategySpec(
+        **base,
+        indicators=[Indicator(id="rsi", type="RSI", window=params.get("rsi_period", 14))],
+        entry=Condition(op="lt", left=rsi,
+                        right=Operand(kind="constant", value=params.get("rsi_oversold", 30))),
+        exit=Condition(op="gt", left=rsi,
+                       right=Operand(kind="constant", value=params.get("rsi_overbought", 70))),
+    )
+
+
+def _sma_crossover_spec(base: dict, params: dict) -> StrategySpec:
+    fast = Operand(kind="indicator", indicator_id="sma_fast", output="ma")
+    slow = Operand(kind="indicator", indicator_id="sma_slow", output="ma")
     return StrategySpec(
-        ticker=ticker, start_date=start_date, end_date=end_date,
-        initial_cash=initial_cash, fees=fees,
+        **base,
         indicators=[
-            Indicator(id="sma_fast", type="SMA", window=fast),
-            Indicator(id="sma_slow", type="SMA", window=slow),
+            Indicator(id="sma_fast", type="SMA", window=params.get("sma_fast", 5)),
+            Indicator(id="sma_slow", type="SMA", window=params.get("sma_slow", 20)),
         ],
-        entry=Condition(op="cross_above", left=sma_operand("sma_fast"), right=sma_operand("sma_slow")),
-        exit=Condition(op="cross_below", left=sma_operand("sma_fast"), right=sma_operand("sma_slow")),
+        entry=Condition(op="cross_above", left=fast, right=slow),
+        exit=Condition(op="cross_below", left=fast, right=slow),
     )
 
 
+_LEGACY_BUILDERS = {"SMA": _sma_crossover_spec, "RSI": _rsi_spec}
+
+
+def _legacy_spec(ticker, strategy, start_date, end_date, initial_cash, fees, **params) -> StrategySpec:
+    base = dict(ticker=ticker, start_date=start_date, end_date=end_date,
+                initial_cash=initial_cash, fees=fees)
+    # Unknown names fall back to the SMA crossover, as before
+    return _LEGACY_BUILDERS.get(strategy, _sma_crossover_spec)(base, params)
+
+
 def run_backtest(ticker="SPY", strategy="SMA", start_date="2015-01-01", end_date=None,
                  initial_cash=100_000, fees=0.001, **strategy_params) -> dict:
     """Legacy entry point used by the /backtest endpoint."""
@@ -7,10 +7,15 @@ shape; Pydantic validates semantics; a single repair retry feeds validation
 errors back to the model. Conversation state lives in the chat history the
 frontend already sends, so the server stays stateless.
 """
+import functools
+import hashlib
 import math
 import re
+import threading
 import time
+from collections import OrderedDict
 
+import orjson
 import yfinance as yf
 from dotenv import load_dotenv
 from google import genai
@@ -89,36 +94,86 @@ Only emit a strategy when you are confident it reflects the user's intent.
 """
 
 # ---------------------------------------------------------------------------
-# Ticker validation (with cache, to avoid repeated yfinance calls)
+# Ticker validation (with a bounded TTL cache, to avoid repeated yfinance calls)
 # ---------------------------------------------------------------------------
 
-_ticker_cache: dict = {}
+class _TTLCache:
+    """Thread-safe LRU mapping whose entries expire after `ttl` seconds, so a
+    long-running server neither grows without bound nor serves stale results
+    forever. `get` returns None on a miss."""
 
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
 
-def is_valid_ticker_format(ticker) -> bool:
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_ticker_cache = _TTLCache(maxsize=4096, ttl=24 * 60 * 60)
+
+_TICKER_RE = re.compile(r"[A-Z0-9.-]{1,10}")
+
+
+def _normalize_ticker(ticker):
+    """The stripped, upper-cased ticker if it is well-formed, else None."""
     if not ticker or not isinstance(ticker, str):
-        return False
+        return None
     ticker = ticker.strip().upper()
-    return bool(re.match(r"^[A-Z0-9.-]{1,10}$", ticker))
+    return ticker if _TICKER_RE.fullmatch(ticker) else None
+
+
+def is_valid_ticker_format(ticker) -> bool:
+    return _normalize_ticker(ticker) is not None
 
 
 def validate_ticker_exists(ticker):
-    """Returns (is_valid, message). Results are cached per process."""
-    if not is_valid_ticker_format(ticker):
+    """Returns (is_valid, message). Definitive answers, positive or negative,
+    are cached per process for a day."""
+    normalized = _normalize_ticker(ticker)
+    if normalized is None:
         return False, f"Ticker '{ticker}' has an invalid format"
-    ticker = ticker.strip().upper()
-    if ticker in _ticker_cache:
-        return _ticker_cache[ticker]
+    ticker = normalized
+    cached = _ticker_cache.get(ticker)
+    if cached is not None:
+        return cached
     try:
         hist = yf.Ticker(ticker).history(period="5d")
-        result = (
-            (True, f"Ticker '{ticker}' is valid")
-            if not hist.empty
-            else (False, f"No market data available for ticker '{ticker}'")
-        )
     except Exception as e:
-        result = (False, f"Could not validate ticker '{ticker}': {e}")
-    _ticker_cache[ticker] = result
+        # Transient (network/rate-limit) failures are not cached, so a blip
+        # can't mark a real ticker invalid for the rest of the day.
+        return False, f"Could not validate ticker '{ticker}': {e}"
+    result = (
+        (True, f"Ticker '{ticker}' is valid")
+        if not hist.empty
+        else (False, f"No market data available for ticker '{ticker}'")
+    )
+    _ticker_cache.set(ticker, result)
     return result
 
 
@@ -126,6 +181,22 @@ def validate_ticker_exists(ticker):
 # Gemini call with structured output + retry/repair
 # ---------------------------------------------------------------------------
 
+# Static per process: generating the AgentResponse JSON Schema takes a few
+# milliseconds, so build the request config once rather than every call.
+_GENERATE_CONFIG = types.GenerateContentConfig(
+    system_instruction=SYSTEM_PROMPT,
+    response_mime_type="application/json",
+    response_json_schema=AgentResponse.model_json_schema(),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client():
+    """One Gemini client per process, so credentials are resolved once and its
+    HTTP connection pool is reused across turns."""
+    return genai.Client()
+
+
 def _build_contents(conversation_history, user_input):
     contents = []
     for msg in conversation_history or []:
@@ -143,11 +214,7 @@ def _generate(client, contents):
             return client.models.generate_content(
                 model=MODEL,
                 contents=contents,
-                config=types.GenerateContentConfig(
-                    system_instruction=SYSTEM_PROMPT,
-                    response_mime_type="application/json",
-                    response_json_schema=AgentResponse.model_json_schema(),
-                ),
+                config=_GENERATE_CONFIG,
             )
         except Exception as e:
             last_error = e
@@ -161,12 +228,20 @@ def _generate(client, contents):
 def _sanitize(obj):
     """Replace NaN/inf with None so the payload is valid JSON (charts render
     nulls as gaps, which is correct for indicator warm-up periods)."""
-    if isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
-        return None
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
     if isinstance(obj, dict):
         return {k: _sanitize(v) for k, v in obj.items()}
     if isinstance(obj, list):
-        return [_sanitize(v) for v in obj]
+        # Chart series are long flat lists of floats, dates, or 0/1 signals:
+        # handle those elements inline and only recurse for anything else.
+        isfinite = math.isfinite
+        return [
+            (v if isfinite(v) else None) if type(v) is float
+            else v if type(v) in (str, int)
+            else _sanitize(v)
+            for v in obj
+        ]
     return obj
 
 
@@ -174,11 +249,27 @@ def _conversation_reply(message):
     return {"conversation": True, "message": message, "needs_clarification": True}
 
 
-def decode_natural_language(user_input, conversation_history=None):
-    client = genai.Client()
-    contents = _build_contents(conversation_history, user_input)
+# Validated agent replies, keyed by the exact conversation that produced them,
+# so a resent turn (client retry, double submit) skips the Gemini round-trip.
+# Only the LLM step is cached; the backtest itself always re-runs.
+_agent_cache = _TTLCache(maxsize=256, ttl=10 * 60)
+
 
-    agent = None
+def _conversation_key(conversation_history, user_input):
+    # Key on exactly what _build_contents sends to the model, so extra client
+    # fields (ids, timestamps) neither split the cache nor break encoding.
+    turns = [
+        (msg.get("role") == "user", msg.get("content", ""))
+        for msg in conversation_history or []
+    ]
+    payload = orjson.dumps([turns, user_input], default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _ask_agent(contents):
+    """Structured call plus one repair retry. Returns a validated
+    AgentResponse, or a conversational reply if none could be obtained."""
+    client = _get_client()
     for attempt in range(2):
         try:
             response = _generate(client, contents)
@@ -189,8 +280,7 @@ def decode_natural_language(user_input, conversation_history=None):
                 "in a moment."
             )
         try:
-            agent = AgentResponse.model_validate_json(response.text)
-            break
+            return AgentResponse.model_validate_json(response.text)
         except ValidationError as e:
             # Repair loop: show the model its own output and the validation
             # errors, and let it try once more.
@@ -208,18 +298,30 @@ def decode_natural_language(user_input, conversation_history=None):
                 )
             )
 
+    return _conversation_reply(
+        "I couldn't turn that into a valid strategy — could you rephrase it? "
+        "For example: \"Buy AAPL when the 50-day SMA crosses above the 200-day "
+        "SMA, sell on the reverse cross.\""
+    )
+
+
+def decode_natural_language(user_input, conversation_history=None):
+    key = _conversation_key(conversation_history, user_input)
+    agent = _agent_cache.get(key)
     if agent is None:
-        return _conversation_reply(
-            "I couldn't turn that into a valid strategy — could you rephrase it? "
-            "For example: \"Buy AAPL when the 50-day SMA crosses above the 200-day "
-            "SMA, sell on the reverse cross.\""
-        )
+        agent = _ask_agent(_build_contents(conversation_history, user_input))
+        if not isinstance(agent, AgentResponse):
+            return agent
+        # Normalize before caching: cached replies are shared across
+        # threadpool workers and must not be mutated afterwards.
+        if agent.strategy is not None:
+            agent.strategy.ticker = agent.strategy.ticker.strip().upper()
+        _agent_cache.set(key, agent)
 
     if agent.strategy is None:
         return _conversation_reply(agent.message)
 
     spec = agent.strategy
-    spec.ticker = spec.ticker.strip().upper()
     is_valid, ticker_message = validate_ticker_exists(spec.ticker)
     if not is_valid:
         return _conversation_reply(
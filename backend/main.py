@@ -1,17 +1,35 @@
+from contextlib import asynccontextmanager
 from typing import Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
-from backend.backtest_loop import run_backtest, run_backtest_spec
+from backend.backtest_loop import run_backtest, run_backtest_spec, warm_up
 from backend.llm_decode import decode_natural_language
 from backend.schema import StrategySpec
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile vectorbt's numba kernels before serving traffic; otherwise the
+    # first backtest after every (re)start pays several seconds of JIT.
+    try:
+        warm_up()
+    except Exception as e:
+        print(f"[startup] engine warm-up failed: {e}")
+    yield
+
+
 app = FastAPI(
     title="BacktestGPT API",
     description="Conversational AI-powered trading strategy backtesting",
     version="2.0.0",
+    # orjson encodes the long chart arrays much faster than the stdlib, and
+    # writes NaN (indicator warm-up bars) as null instead of failing.
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 # Wildcard origins require credentials to be disabled per the CORS spec;
 # the API is token-free so no credentials are needed.
@@ -55,8 +73,11 @@ class NaturalBacktestRequest(BaseModel):
     conversation_history: Optional[list] = []
 
 
+# The endpoints below block on network I/O (yfinance, Gemini) and CPU-bound
+# simulation, so they are plain `def`: FastAPI runs them in its threadpool
+# instead of on the event loop, and one slow request no longer stalls the rest.
 @app.post("/backtest")
-async def backtest_endpoint(request: BacktestRequest):
+def backtest_endpoint(request: BacktestRequest):
     """Run a named preset strategy (SMA crossover or RSI)."""
     try:
         result = run_backtest(
@@ -82,7 +103,7 @@ async def backtest_endpoint(request: BacktestRequest):
 
 
 @app.post("/backtest_spec")
-async def backtest_spec_endpoint(spec: StrategySpec):
+def backtest_spec_endpoint(spec: StrategySpec):
     """Run a fully-specified strategy AST directly (no LLM involved)."""
     result = run_backtest_spec(spec)
     if result.get("error"):
@@ -91,7 +112,7 @@ async def backtest_spec_endpoint(spec: StrategySpec):
 
 
 @app.post("/natural_backtest")
-async def natural_backtest_endpoint(request: NaturalBacktestRequest):
+def natural_backtest_endpoint(request: NaturalBacktestRequest):
     """Conversational natural-language backtesting."""
     try:
         result = decode_natural_language(request.input, request.conversation_history)
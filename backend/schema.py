@@ -8,6 +8,7 @@ that reaches the backtest engine is guaranteed executable.
 """
 from __future__ import annotations
 
+from difflib import get_close_matches
 from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
@@ -147,34 +148,34 @@ class StrategySpec(BaseModel):
             raise ValueError("indicator ids must be unique")
         by_id = {ind.id: ind for ind in self.indicators}
 
-        def check_operand(operand: Optional[Operand]) -> None:
-            if operand is None:
-                return
-            if operand.kind == "indicator":
-                ind = by_id.get(operand.indicator_id)
+        # Iterative walk over every condition and operand node (entry first,
+        # left to right), so deep expression trees cost no Python recursion.
+        stack: list = [self.exit, self.entry]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if isinstance(node, Condition):
+                stack.extend(reversed(node.conditions or []))
+                stack.extend((node.right, node.left))
+                continue
+            if node.kind == "indicator":
+                ind = by_id.get(node.indicator_id)
                 if ind is None:
+                    # The message feeds the repair loop, so point at the
+                    # likely intended id (e.g. 'sma_50' -> 'sma50').
+                    close = get_close_matches(node.indicator_id, by_id, n=1)
+                    hint = f"; did you mean '{close[0]}'?" if close else ""
                     raise ValueError(
-                        f"condition references undeclared indicator '{operand.indicator_id}'"
+                        f"condition references undeclared indicator '{node.indicator_id}'{hint}"
                     )
                 valid_outputs = INDICATOR_OUTPUTS[ind.type]
-                if operand.output is not None and operand.output not in valid_outputs:
+                if node.output is not None and node.output not in valid_outputs:
                     raise ValueError(
                         f"indicator '{ind.id}' ({ind.type}) has no output "
-                        f"'{operand.output}'; valid outputs: {', '.join(valid_outputs)}"
+                        f"'{node.output}'; valid outputs: {', '.join(valid_outputs)}"
                     )
-            check_operand(operand.operand)
-            check_operand(operand.left)
-            check_operand(operand.right)
-
-        def check_condition(cond: Condition) -> None:
-            check_operand(cond.left)
-            check_operand(cond.right)
-            for sub in cond.conditions or []:
-                check_condition(sub)
-
-        check_condition(self.entry)
-        if self.exit is not None:
-            check_condition(self.exit)
+            stack.extend((node.right, node.left, node.operand))
         return self
 
 
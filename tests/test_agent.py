@@ -6,7 +6,11 @@ from types import SimpleNamespace
 import pytest
 
 from backend import llm_decode
-from backend.llm_decode import decode_natural_language, is_valid_ticker_format
+from backend.llm_decode import (
+    decode_natural_language,
+    is_valid_ticker_format,
+    validate_ticker_exists,
+)
 
 
 class FakeModels:
@@ -19,6 +23,32 @@ class FakeModels:
         return SimpleNamespace(text=self._responses.pop(0))
 
 
+@pytest.fixture
+def yf_lookups(monkeypatch):
+    """Stub yfinance so ticker lookups are recorded instead of hitting the network."""
+    calls = []
+
+    def fake_ticker(symbol):
+        calls.append(symbol)
+        return SimpleNamespace(history=lambda period: SimpleNamespace(empty=False))
+
+    llm_decode._ticker_cache.clear()
+    monkeypatch.setattr(llm_decode.yf, "Ticker", fake_ticker)
+    yield calls
+    llm_decode._ticker_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_agent_state():
+    """The Gemini client and agent replies are cached per process; give each
+    test its own."""
+    llm_decode._get_client.cache_clear()
+    llm_decode._agent_cache.clear()
+    yield
+    llm_decode._get_client.cache_clear()
+    llm_decode._agent_cache.clear()
+
+
 def fake_client(monkeypatch, responses):
     models = FakeModels(responses)
     monkeypatch.setattr(llm_decode.genai, "Client", lambda: SimpleNamespace(models=models))
@@ -43,12 +73,62 @@ COMPLETE_STRATEGY = {
 }
 
 
-def test_ticker_format_validation():
-    assert is_valid_ticker_format("AAPL")
-    assert is_valid_ticker_format("BRK.B")
-    assert not is_valid_ticker_format("")
-    assert not is_valid_ticker_format("WAY_TOO_LONG_TICKER")
-    assert not is_valid_ticker_format(None)
+TICKER_FORMAT_CASES = (
+    ("AAPL", True),
+    ("BRK.B", True),
+    ("", False),
+    ("WAY_TOO_LONG_TICKER", False),
+    (None, False),
+)
+
+
+@pytest.mark.parametrize("ticker,expected", TICKER_FORMAT_CASES)
+def test_ticker_format_validation(ticker, expected):
+    assert is_valid_ticker_format(ticker) is expected
+
+
+def test_duplicate_ticker_lookups_share_one_request(yf_lookups):
+    for ticker in ("AAPL", " aapl ", "Aapl"):
+        assert validate_ticker_exists(ticker)[0]
+    assert yf_lookups == ["AAPL"]  # cache keyed on the normalized ticker
+
+
+def test_ticker_cache_expires_entries(yf_lookups, monkeypatch):
+    assert validate_ticker_exists("AAPL")[0]
+    assert validate_ticker_exists("AAPL")[0]
+    assert yf_lookups == ["AAPL"]
+    monkeypatch.setattr(llm_decode._ticker_cache, "ttl", 0)
+    validate_ticker_exists("AAPL")
+    assert yf_lookups == ["AAPL", "AAPL"]
+
+
+def test_ticker_cache_keeps_negatives_but_not_errors(yf_lookups, monkeypatch):
+    def unknown(symbol):
+        yf_lookups.append(symbol)
+        return SimpleNamespace(history=lambda period: SimpleNamespace(empty=True))
+
+    monkeypatch.setattr(llm_decode.yf, "Ticker", unknown)
+    assert not validate_ticker_exists("ZZZZ")[0]
+    assert not validate_ticker_exists("ZZZZ")[0]
+    assert yf_lookups == ["ZZZZ"]  # unknown ticker answered from cache
+
+    def flaky(symbol):
+        yf_lookups.append(symbol)
+        raise ConnectionError("rate limited")
+
+    monkeypatch.setattr(llm_decode.yf, "Ticker", flaky)
+    assert "Could not validate" in validate_ticker_exists("AAPL")[1]
+    assert "Could not validate" in validate_ticker_exists("AAPL")[1]
+    assert yf_lookups == ["ZZZZ", "AAPL", "AAPL"]  # errors retried
+
+
+def test_ticker_cache_is_bounded(yf_lookups, monkeypatch):
+    monkeypatch.setattr(llm_decode._ticker_cache, "maxsize", 2)
+    for ticker in ("AAPL", "MSFT", "NVDA"):
+        validate_ticker_exists(ticker)
+    assert len(llm_decode._ticker_cache) == 2
+    validate_ticker_exists("AAPL")  # least recently used, so it was evicted
+    assert yf_lookups == ["AAPL", "MSFT", "NVDA", "AAPL"]
 
 
 def test_clarification_turn(monkeypatch):
@@ -80,6 +160,22 @@ def test_complete_strategy_runs_backtest(monkeypatch):
     assert result["metrics"]["total_return"] is None  # NaN sanitized to null
 
 
+def test_sanitize_scrubs_chart_series():
+    nan, inf = float("nan"), float("inf")
+    payload = {
+        "equity": [nan, 1.5, inf, -inf],
+        "dates": ["2024-01-01", "2024-01-02"],
+        "signals": {"Entries": [0, 1]},
+        "nested": [[nan, 2.0], {"x": nan}],
+    }
+    assert llm_decode._sanitize(payload) == {
+        "equity": [None, 1.5, None, None],
+        "dates": ["2024-01-01", "2024-01-02"],
+        "signals": {"Entries": [0, 1]},
+        "nested": [[None, 2.0], {"x": None}],
+    }
+
+
 def test_repair_loop_recovers_from_invalid_json(monkeypatch):
     models = fake_client(
         monkeypatch,
@@ -134,3 +230,45 @@ def test_conversation_history_passed_to_model(monkeypatch):
     contents = models.calls[0]["contents"]
     assert [c.role for c in contents] == ["model", "user", "user"]
     assert contents[-1].parts[0].text == "use RSI"
+
+
+def test_client_reused_across_turns(monkeypatch):
+    models = FakeModels(['{"message": "ok", "strategy": null}'] * 2)
+    created = []
+
+    def make_client():
+        created.append(True)
+        return SimpleNamespace(models=models)
+
+    monkeypatch.setattr(llm_decode.genai, "Client", make_client)
+    decode_natural_language("Trade AAPL")
+    decode_natural_language("use RSI")
+    assert len(created) == 1
+    assert len(models.calls) == 2
+
+
+def test_identical_turn_served_from_cache(monkeypatch):
+    models = fake_client(monkeypatch, [json.dumps(COMPLETE_STRATEGY)])
+    monkeypatch.setattr(llm_decode, "validate_ticker_exists", lambda t: (True, "ok"))
+    runs = []
+    monkeypatch.setattr(
+        llm_decode, "run_backtest_spec", lambda spec: runs.append(spec) or {"metrics": {}}
+    )
+    history = [{"role": "user", "content": "Trade Apple"}]
+    first = decode_natural_language("golden cross", conversation_history=history)
+    second = decode_natural_language("golden cross", conversation_history=history)
+    assert len(models.calls) == 1  # second turn never reached Gemini
+    assert len(runs) == 2  # but the backtest itself re-ran
+    assert first["message"] == second["message"]
+    assert [spec.ticker for spec in runs] == ["AAPL", "AAPL"]
+
+
+def test_cache_key_ignores_extra_history_fields(monkeypatch):
+    models = fake_client(monkeypatch, ['{"message": "Which ticker?", "strategy": null}'])
+    history = [{"role": "user", "content": "hi", "id": 123456789012345678901234567890}]
+    first = decode_natural_language("trade", conversation_history=history)
+    second = decode_natural_language(
+        "trade", conversation_history=[{"role": "user", "content": "hi", "ts": {1: "x"}}]
+    )
+    assert first == second
+    assert len(models.calls) == 1
@@ -1,6 +1,9 @@
 """API-level tests using FastAPI's TestClient (no network required)."""
+import numpy as np
+import pandas as pd
 from fastapi.testclient import TestClient
 
+from backend import backtest_loop
 from backend.main import app
 
 client = TestClient(app)
@@ -26,3 +29,21 @@ def test_backtest_rejects_invalid_body():
 def test_natural_backtest_requires_input():
     res = client.post("/natural_backtest", json={})
     assert res.status_code == 422
+
+
+def test_backtest_spec_serializes_warmup_nans_as_null(monkeypatch):
+    idx = pd.date_range("2022-01-01", periods=120, freq="D")
+    close = pd.Series(100 + np.cumsum(np.random.default_rng(7).normal(0, 1, 120)), index=idx)
+    price = {"Close": close, "Open": close, "High": close + 1, "Low": close - 1,
+             "Volume": pd.Series(1_000_000.0, index=idx)}
+    monkeypatch.setattr(backtest_loop, "fetch_price_data", lambda *a, **k: price)
+    sma = {"kind": "indicator", "indicator_id": "sma20"}
+    res = client.post("/backtest_spec", json={
+        "ticker": "TEST",
+        "indicators": [{"id": "sma20", "type": "SMA", "window": 20}],
+        "entry": {"op": "gt", "left": {"kind": "price", "column": "Close"}, "right": sma},
+    })
+    assert res.status_code == 200
+    series = res.json()["chart_data"]["indicators"]["sma20"]
+    assert series[0] is None  # warm-up bar
+    assert series[-1] is not None
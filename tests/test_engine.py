@@ -9,6 +9,7 @@ from backend.backtest_loop import (
     compute_indicators,
     evaluate_condition,
     run_backtest_spec,
+    warm_up,
 )
 from backend.schema import Condition, Indicator, Operand, StrategySpec
 
@@ -219,3 +220,11 @@ def test_spec_run_surfaces_fetch_error(monkeypatch):
     )
     result = run_backtest_spec(spec)
     assert "No price data" in result["error"]
+
+
+def test_warm_up_runs_offline(monkeypatch):
+    def no_network(*a, **k):
+        raise AssertionError("warm-up must not fetch market data")
+
+    monkeypatch.setattr(backtest_loop, "fetch_price_data", no_network)
+    warm_up()
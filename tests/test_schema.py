@@ -70,6 +70,13 @@ def test_undeclared_indicator_reference_rejected():
         StrategySpec.model_validate(spec)
 
 
+def test_undeclared_indicator_suggests_close_id():
+    spec = sma_cross_spec()
+    spec["entry"]["left"]["indicator_id"] = "sma_50"  # typo of 'sma50'
+    with pytest.raises(ValidationError, match="did you mean 'sma50'"):
+        StrategySpec.model_validate(spec)
+
+
 def test_invalid_output_for_indicator_type_rejected():
     spec = sma_cross_spec()
     spec["entry"]["left"]["output"] = "rsi"  # SMA has no 'rsi' output